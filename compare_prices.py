@@ -1,12 +1,26 @@
 import asyncio
+import logging
 import os
 import random
 import re
-from dataclasses import dataclass
-from typing import Optional, List
-from urllib.parse import urlparse, parse_qs
+import sys
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import AsyncIterator, Deque, Dict, Optional, List, Tuple
+from urllib.parse import unquote_plus, urlparse
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+log = logging.getLogger(__name__)
 
 
 @dataclass
@@ -29,7 +43,9 @@ class PriceResult:
     notes: str = ""
 
 
-DEFAULT_TIMEOUT_MS = 30000
+DEFAULT_TIMEOUT_MS = 12000
+NAVIGATION_TIMEOUT_MS = 10000
+STATIC_FETCH_TIMEOUT_MS = 3000
 BOOKING_PRICE_SELECTORS = [
     'span[data-testid="price-and-discounted-price"]',
     'div[data-testid="price-and-discounted-price"]',
@@ -41,61 +57,286 @@ AGODA_PRICE_SELECTORS = [
     'span[data-selenium="display-price"]',
     'span[data-selenium="price"]',
 ]
-
-
+AGODA_SEARCH_KEYS = {"selectedproperty", "hotel", "checkIn"}
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_URL_PARTS = (
+    "doubleclick",
+    "googletagmanager",
+    "google-analytics",
+    "facebook.net",
+    "hotjar",
+)
+
+USER_AGENT_PLATFORMS = {
+    "win32": "Windows NT 10.0; Win64; x64",
+    "darwin": "Macintosh; Intel Mac OS X 10_15_7",
+    "linux": "X11; Linux x86_64",
+}
+DEFAULT_VIEWPORT = {"width": 1280, "height": 800}
+SITE_CONTEXT_OPTIONS = {
+    "default": {"locale": "en-US", "accept_language": "en-US,en;q=0.9"},
+}
+SITE_ORIGINS = {
+    "booking": "https://www.booking.com/",
+    "agoda": "https://www.agoda.com/",
+}
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+READ_TEXTS_JS = """(fields) => Object.fromEntries(
+    Object.entries(fields).map(([name, sel]) => [name, document.querySelector(sel)?.innerText || ""])
+)"""
+
+RESULT_CACHE_TTL_S = 15 * 60
+RESULT_CACHE_MAX_ENTRIES = 1024
+
+_SIMPLE_SELECTOR_RE = re.compile(r'^(\w+)\[([\w-]+)="([^"]*)"\]$')
+_CURRENCY_RE = re.compile(r"¥|￥|US\$|USD|RMB|円|,")
+_PRICE_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+@lru_cache(maxsize=1024)
 def is_agoda_search_url(url: str) -> bool:
     parsed = urlparse(url)
     if "agoda.com" not in parsed.netloc:
         return False
     if parsed.path.rstrip("/") != "/search":
         return False
-    params = parse_qs(parsed.query)
-    return any(key in params for key in ("selectedproperty", "hotel", "checkIn"))
+    keys = {unquote_plus(key) for key, _, value in (pair.partition("=") for pair in parsed.query.split("&")) if value}
+    return not keys.isdisjoint(AGODA_SEARCH_KEYS)
 
 
 def extract_price_number(text: Optional[str]) -> Optional[float]:
     if not text:
         return None
-    cleaned = (
-        text.replace("¥", "")
-        .replace("￥", "")
-        .replace("US$", "")
-        .replace("USD", "")
-        .replace("RMB", "")
-        .replace(",", "")
-        .strip()
-    )
-    match = re.search(r"\d+(?:\.\d+)?", cleaned)
+    match = _PRICE_RE.search(_CURRENCY_RE.sub("", text))
     if not match:
         return None
     return float(match.group(0))
 
 
-async def polite_wait():
-    await asyncio.sleep(random.uniform(1.5, 3.5))
+_result_cache: "OrderedDict[Tuple, Tuple[float, PriceResult]]" = OrderedDict()
 
 
-async def first_visible_text(page, selectors: List[str], timeout_ms: int = DEFAULT_TIMEOUT_MS) -> Optional[str]:
-    combined = ",".join(selectors)
-    await page.wait_for_selector(combined, timeout=timeout_ms, state="visible")
-    locator = page.locator(combined).first
-    return await locator.inner_text()
+def cache_key(site: str, query: Query) -> Tuple:
+    override_url = os.getenv("AGODA_URL") if site == "agoda" else None
+    return (site, query.hotel_name, query.city, query.checkin, query.checkout, query.adults, query.rooms, override_url)
 
 
-async def fetch_booking(query: Query, page) -> PriceResult:
-    url = (
+def get_cached_result(site: str, query: Query) -> Optional[PriceResult]:
+    """Return a copy of the priced result for ``site`` fetched within RESULT_CACHE_TTL_S seconds, if any."""
+    key = cache_key(site, query)
+    cached = _result_cache.get(key)
+    if cached is None:
+        return None
+    if time.monotonic() - cached[0] >= RESULT_CACHE_TTL_S:
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return replace(cached[1])
+
+
+def store_result(site: str, query: Query, result: PriceResult) -> None:
+    if result.price is None:
+        return
+    key = cache_key(site, query)
+    _result_cache[key] = (time.monotonic(), replace(result))
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+        _result_cache.popitem(last=False)
+
+
+class SelectorTextParser(HTMLParser):
+    """Collects the text of the first element matching each field's ``tag[attr="value"]`` selectors.
+
+    Selectors in any other form are skipped here; the renderer path still honours them.
+    """
+
+    def __init__(self, fields: Dict[str, List[str]]):
+        super().__init__(convert_charrefs=True)
+        self._targets = {
+            name: [match.groups() for match in map(_SIMPLE_SELECTOR_RE.match, selectors) if match]
+            for name, selectors in fields.items()
+        }
+        self._stack: List[str] = []
+        self._open: Dict[str, int] = {}
+        self._parts: Dict[str, List[str]] = {}
+        self.texts: Dict[str, str] = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        self._stack.append(tag)
+        attr_map = dict(attrs)
+        for name, targets in self._targets.items():
+            if name in self.texts or name in self._open:
+                continue
+            if any(tag == t_tag and attr_map.get(t_attr) == t_value for t_tag, t_attr, t_value in targets):
+                self._open[name] = len(self._stack) - 1
+                self._parts[name] = []
+
+    def handle_endtag(self, tag):
+        # Close the nearest open element with this name, implicitly closing any unclosed children;
+        # stray end tags with no matching open element are ignored, as browsers do.
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index] == tag:
+                break
+        else:
+            return
+        del self._stack[index:]
+        for name in [name for name, start in self._open.items() if start >= index]:
+            self._finish(name)
+
+    def handle_data(self, data):
+        for name in self._open:
+            self._parts[name].append(data)
+
+    def close(self):
+        super().close()
+        for name in list(self._open):
+            self._finish(name)
+
+    def _finish(self, name: str) -> None:
+        del self._open[name]
+        self.texts[name] = "".join(self._parts.pop(name))
+
+
+def extract_texts(content: str, fields: Dict[str, List[str]]) -> Dict[str, str]:
+    """Parse ``content`` once in-process and return each field's text ("" when absent)."""
+    parser = SelectorTextParser(fields)
+    parser.feed(content)
+    parser.close()
+    return {name: parser.texts.get(name, "") for name in fields}
+
+
+async def block_heavy_resources(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        part in request.url for part in BLOCKED_URL_PARTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def desktop_user_agent(browser_version: str) -> str:
+    """Build a non-headless Chrome UA for the launched browser's major version and host OS."""
+    platform = USER_AGENT_PLATFORMS.get(sys.platform, USER_AGENT_PLATFORMS["linux"])
+    major = browser_version.split(".", 1)[0]
+    return f"Mozilla/5.0 ({platform}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36"
+
+
+async def polite_wait(origin: str, last_hit: Dict[str, float]) -> None:
+    """Space requests to the same origin 1.5-3.5s apart; the first one goes straight through."""
+    now = asyncio.get_running_loop().time()
+    ready_at = now
+    if origin in last_hit:
+        ready_at = max(now, last_hit[origin] + random.uniform(1.5, 3.5))
+    last_hit[origin] = ready_at
+    await asyncio.sleep(ready_at - now)
+
+
+async def visible_texts(
+    page,
+    ready_selectors: List[str],
+    fields: Dict[str, List[str]],
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+) -> Dict[str, str]:
+    """Wait for ``ready_selectors`` and read every field's text in one evaluate call."""
+    await page.wait_for_selector(",".join(ready_selectors), timeout=timeout_ms, state="visible")
+    return await page.evaluate(
+        READ_TEXTS_JS,
+        {name: ",".join(selectors) for name, selectors in fields.items()},
+    )
+
+
+def booking_url(query: Query) -> str:
+    return (
         "https://www.booking.com/searchresults.html"
         f"?ss={query.hotel_name}+{query.city}"
         f"&checkin={query.checkin}&checkout={query.checkout}"
         f"&group_adults={query.adults}&no_rooms={query.rooms}"
     )
-    await page.goto(url, wait_until="networkidle")
-    price_text = await first_visible_text(page, BOOKING_PRICE_SELECTORS)
-    price = extract_price_number(price_text)
-    await polite_wait()
+
+
+async def fetch_static_html(context, url: str) -> Optional[Tuple[str, str]]:
+    """GET ``url`` without the renderer; return ``(final_url, html)`` or None on any failure."""
+    try:
+        response = await context.request.get(
+            url,
+            headers={"Accept-Language": "en-US"},
+            timeout=STATIC_FETCH_TIMEOUT_MS,
+        )
+        if not response.ok:
+            return None
+        return response.url, await response.text()
+    except PlaywrightError:
+        return None
+
+
+def parse_static_texts(content: str, fields: Dict[str, List[str]]) -> Optional[Dict[str, str]]:
+    """extract_texts for the fast paths: any parse failure returns None so the renderer path runs."""
+    try:
+        return extract_texts(content, fields)
+    except Exception as exc:
+        log.debug("static HTML parse failed: %s", exc)
+        return None
+
+
+async def fetch_booking_fast(query: Query, context) -> Optional[PriceResult]:
+    """Try the server-rendered HTML first; return None so the caller can fall back to the renderer."""
+    url = booking_url(query)
+    fetched = await fetch_static_html(context, url)
+    if fetched is None:
+        return None
+    texts = parse_static_texts(fetched[1], {"price": BOOKING_PRICE_SELECTORS})
+    if texts is None:
+        return None
+    price = extract_price_number(texts["price"])
+    if price is None:
+        return None
     return PriceResult("booking", query.hotel_name, price, "USD", url, "total price")
 
 
+async def fetch_agoda_fast(query: Query, context, url: str) -> Optional[PriceResult]:
+    """Read a server-rendered Agoda override page; return None so the caller can fall back to the renderer."""
+    fetched = await fetch_static_html(context, url)
+    if fetched is None:
+        return None
+    final_url, content = fetched
+    if not is_agoda_search_url(final_url):
+        return None
+    texts = parse_static_texts(content, {"price": AGODA_PRICE_SELECTORS, "currency": AGODA_CURRENCY_SELECTORS})
+    if texts is None:
+        return None
+    price = extract_price_number(texts["price"])
+    if price is None:
+        return None
+    return PriceResult("agoda", query.hotel_name, price, texts["currency"].strip(), final_url, "total price")
+
+
+async def fetch_booking(query: Query, page) -> PriceResult:
+    fast_result = await fetch_booking_fast(query, page.context)
+    if fast_result is not None:
+        return fast_result
+    url = booking_url(query)
+    await page.goto(url, wait_until="domcontentloaded")
+    texts = await visible_texts(page, BOOKING_PRICE_SELECTORS, {"price": BOOKING_PRICE_SELECTORS})
+    price = extract_price_number(texts["price"])
+    return PriceResult("booking", query.hotel_name, price, "USD", url, "total price")
+
+
+def agoda_redirect_result(query: Query, url: str) -> PriceResult:
+    return PriceResult(
+        "agoda",
+        query.hotel_name,
+        None,
+        "",
+        url,
+        "redirected to non-search page; copy the full Agoda results URL",
+    )
+
+
 async def fetch_agoda(query: Query, page) -> PriceResult:
     override_url = os.getenv("AGODA_URL")
     if override_url:
@@ -108,36 +349,47 @@ async def fetch_agoda(query: Query, page) -> PriceResult:
             f"&rooms={query.rooms}&adults={query.adults}"
             f"&hotelName={query.hotel_name}"
         )
-    await page.goto(url, wait_until="networkidle")
-    if override_url and not is_agoda_search_url(page.url):
-        await polite_wait()
-        return PriceResult(
-            "agoda",
-            query.hotel_name,
-            None,
-            "",
-            page.url,
-            "redirected to non-search page; copy the full Agoda results URL",
-        )
-    try:
-        price_text = await first_visible_text(page, AGODA_PRICE_SELECTORS)
+    if override_url:
+        fast_result = await fetch_agoda_fast(query, page.context, url)
+        if fast_result is not None:
+            return fast_result
+    await page.goto(url, wait_until="domcontentloaded")
+    if override_url:
         try:
-            currency_text = await first_visible_text(page, AGODA_CURRENCY_SELECTORS, timeout_ms=5000)
+            await page.wait_for_load_state("load")
         except PlaywrightTimeoutError:
-            currency_text = ""
-        price = extract_price_number(price_text)
+            pass
+    if override_url and not is_agoda_search_url(page.url):
+        return agoda_redirect_result(query, page.url)
+    try:
+        texts = await visible_texts(
+            page,
+            AGODA_PRICE_SELECTORS,
+            {"price": AGODA_PRICE_SELECTORS, "currency": AGODA_CURRENCY_SELECTORS},
+        )
+        currency_text = texts["currency"]
+        price = extract_price_number(texts["price"])
         notes = "total price"
     except PlaywrightTimeoutError:
+        if override_url and not is_agoda_search_url(page.url):
+            return agoda_redirect_result(query, page.url)
         currency_text = ""
         price = None
         notes = "price selector timed out; check Agoda page or selector"
-    await polite_wait()
     return PriceResult("agoda", query.hotel_name, price, currency_text.strip(), page.url, notes)
 
 
+SITE_FETCHERS = {
+    "agoda": fetch_agoda,
+    "booking": fetch_booking,
+}
+
+
 async def capture_debug(page, site: str):
     if os.getenv("DEBUG_ARTIFACTS") != "1":
         return
+    if page.url == "about:blank":
+        return
     try:
         await page.screenshot(path=f"debug_{site}.png", full_page=True)
         content = await page.content()
@@ -151,8 +403,16 @@ async def safe_fetch(fetcher, site: str, query: Query, page) -> PriceResult:
     try:
         result = await fetcher(query, page)
         await capture_debug(page, site)
+        log.info(
+            "%s: %s %.2f (%s)",
+            result.site,
+            result.currency or "?",
+            result.price if result.price is not None else float("nan"),
+            result.notes or "no notes",
+        )
         return result
     except PlaywrightTimeoutError:
+        log.warning("%s: timeout while waiting for price selector", site)
         await capture_debug(page, site)
         return PriceResult(
             site,
@@ -163,6 +423,7 @@ async def safe_fetch(fetcher, site: str, query: Query, page) -> PriceResult:
             "timeout while waiting for price selector",
         )
     except Exception as exc:
+        log.warning("%s: failed to fetch price: %s", site, exc)
         await capture_debug(page, site)
         return PriceResult(
             site,
@@ -174,22 +435,198 @@ async def safe_fetch(fetcher, site: str, query: Query, page) -> PriceResult:
         )
 
 
-async def compare_prices(query: Query) -> List[PriceResult]:
-    async with async_playwright() as p:
-        headless = os.getenv("HEADLESS", "1") != "0"
-        browser = await p.chromium.launch(headless=headless)
+class BrowserPool:
+    """Keeps one Playwright instance and Chromium browser alive across queries.
+
+    Use it as ``async with BrowserPool() as pool`` and pass ``pool`` to the compare
+    functions to share the browser; without a pool each call launches and closes its own.
+    """
+
+    def __init__(self, headless: Optional[bool] = None):
+        if headless is None:
+            headless = os.getenv("HEADLESS", "1") != "0"
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._user_agent = None
+        self._lock = asyncio.Lock()
+
+    async def _get_browser(self):
+        async with self._lock:
+            if self._browser is None:
+                self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                except BaseException:
+                    # Stop the driver so a failed launch (e.g. browsers not installed) leaves nothing running.
+                    await self._playwright.stop()
+                    self._playwright = None
+                    raise
+                self._user_agent = desktop_user_agent(self._browser.version)
+            return self._browser
+
+    async def new_context(self, site: str):
+        browser = await self._get_browser()
+        options = SITE_CONTEXT_OPTIONS.get(site, SITE_CONTEXT_OPTIONS["default"])
         context = await browser.new_context(
-            locale="en-US",
-            extra_http_headers={"Accept-Language": "en-US,en;q=0.9"},
+            locale=options["locale"],
+            user_agent=self._user_agent,
+            extra_http_headers={"Accept-Language": options["accept_language"]},
+            viewport=DEFAULT_VIEWPORT,
+            bypass_csp=True,
+            service_workers="block",
         )
+        context.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+        context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+        await context.route("**/*", block_heavy_resources)
+        return context
+
+    @asynccontextmanager
+    async def acquire_context(self, site: str):
+        context = await self.new_context(site)
+        try:
+            yield context
+        finally:
+            await context.close()
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+@asynccontextmanager
+async def pool_or_temporary(pool: Optional[BrowserPool]):
+    """Use the caller's pool, or open one that is closed again on exit."""
+    if pool is not None:
+        yield pool
+        return
+    async with BrowserPool() as temporary_pool:
+        yield temporary_pool
+
+
+async def fetch_in_context(pool: BrowserPool, fetcher, site: str, query: Query) -> PriceResult:
+    cached = get_cached_result(site, query)
+    if cached is not None:
+        return cached
+    async with pool.acquire_context(site) as context:
         page = await context.new_page()
-        results = [
-            await safe_fetch(fetch_agoda, "agoda", query, page),
-            await safe_fetch(fetch_booking, "booking", query, page),
+        result = await safe_fetch(fetcher, site, query, page)
+    store_result(site, query, result)
+    return result
+
+
+def _raise_first_error(outcomes: list) -> list:
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return outcomes
+
+
+async def _gather_settled(coros) -> list:
+    """Gather ``coros`` with return_exceptions; even when cancelled, wait until every one has finished."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+async def compare_prices(query: Query, pool: Optional[BrowserPool] = None) -> List[PriceResult]:
+    async with pool_or_temporary(pool) as active_pool:
+        outcomes = await asyncio.gather(
+            *(fetch_in_context(active_pool, fetcher, site, query) for site, fetcher in SITE_FETCHERS.items()),
+            return_exceptions=True,
+        )
+    return _raise_first_error(outcomes)
+
+
+async def iter_prices(query: Query, pool: Optional[BrowserPool] = None) -> AsyncIterator[PriceResult]:
+    """Yield each site's result as soon as it finishes, fastest first."""
+    async with pool_or_temporary(pool) as active_pool:
+        tasks = [
+            asyncio.ensure_future(fetch_in_context(active_pool, fetcher, site, query))
+            for site, fetcher in SITE_FETCHERS.items()
         ]
-        await context.close()
-        await browser.close()
-        return results
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def compare_many(
+    queries: List[Query],
+    concurrency: int = 4,
+    pool: Optional[BrowserPool] = None,
+) -> List[List[PriceResult]]:
+    """Compare several queries at once, reusing at most ``concurrency`` contexts per site."""
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    async with pool_or_temporary(pool) as active_pool:
+        return await _compare_many(queries, concurrency, active_pool)
+
+
+async def _compare_many(queries: List[Query], concurrency: int, pool: BrowserPool) -> List[List[PriceResult]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    idle_contexts: Dict[str, Deque] = defaultdict(deque)
+    last_hit: Dict[str, float] = {}
+
+    async def fetch_site(fetcher, site: str, query: Query) -> PriceResult:
+        cached = get_cached_result(site, query)
+        if cached is not None:
+            return cached
+        await polite_wait(SITE_ORIGINS[site], last_hit)
+        idle = idle_contexts[site]
+        context = idle.popleft() if idle else await pool.new_context(site)
+        reusable = False
+        try:
+            page = await context.new_page()
+            try:
+                result = await safe_fetch(fetcher, site, query, page)
+            finally:
+                await page.close()
+            reusable = True
+        finally:
+            # Only a context that just served a page goes back to the pool; a failed one is closed.
+            if reusable:
+                idle.append(context)
+            else:
+                await asyncio.gather(context.close(), return_exceptions=True)
+        store_result(site, query, result)
+        return result
+
+    async def run_query(query: Query) -> List[PriceResult]:
+        async with semaphore:
+            outcomes = await _gather_settled(
+                fetch_site(fetcher, site, query) for site, fetcher in SITE_FETCHERS.items()
+            )
+            return _raise_first_error(outcomes)
+
+    try:
+        # Every fetch has settled (even on cancellation) before the idle contexts are closed.
+        outcomes = await _gather_settled(run_query(query) for query in queries)
+    finally:
+        await asyncio.gather(
+            *(context.close() for contexts in idle_contexts.values() for context in contexts),
+            return_exceptions=True,
+        )
+    return _raise_first_error(outcomes)
 
 
 def summarize(results: List[PriceResult]) -> List[PriceResult]:
@@ -204,15 +641,23 @@ def format_result(result: PriceResult) -> str:
 
 
 def print_results(results: List[PriceResult]) -> None:
-    if os.getenv("FULL_OUTPUT") == "1":
-        for result in results:
-            print(result)
+    if not results:
         return
-    for result in results:
-        print(format_result(result))
+    render = repr if os.getenv("FULL_OUTPUT") == "1" else format_result
+    sys.stdout.write("\n".join(render(result) for result in results) + "\n")
+
+
+async def main(query: Query) -> List[PriceResult]:
+    async with BrowserPool() as pool:
+        results = []
+        async for result in iter_prices(query, pool):
+            print_results([result])
+            results.append(result)
+        return results
 
 
 if __name__ == "__main__":  #An example of a hotel in Tokyo
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(), format="%(levelname)s %(name)s: %(message)s")
     query = Query(
         hotel_name="Hotel Keihan Tsukiji Ginza Grande",
         city="Tokyo",
@@ -221,10 +666,12 @@ if __name__ == "__main__":  #An example of a hotel in Tokyo
         adults=2,
         rooms=1,
     )
-    final_results = asyncio.run(compare_prices(query))
+    # uvloop.run only exists from uvloop 0.18; older installs fall back to the default loop.
+    run = getattr(uvloop, "run", None) or asyncio.run
+    final_results = run(main(query))
     sorted_results = summarize(final_results)
     if not sorted_results:
-        print("No prices found. Showing diagnostics for each site:")
-        print_results(final_results)
+        sys.stdout.write("No prices found; see the diagnostics above for each site.\n")
     else:
+        sys.stdout.write("Sorted by price:\n")
         print_results(sorted_results)
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+import compare_prices  # noqa: E402
+from compare_prices import BrowserPool, Query, compare_prices as run_compare_prices  # noqa: E402
+
+
+class FakeChromium:
+    def __init__(self, error):
+        self.error = error
+
+    async def launch(self, **kwargs):
+        raise self.error
+
+
+class FakePlaywright:
+    def __init__(self, error):
+        self.chromium = FakeChromium(error)
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+class FakeStarter:
+    def __init__(self, error):
+        self.error = error
+        self.started = []
+
+    async def start(self):
+        driver = FakePlaywright(self.error)
+        self.started.append(driver)
+        return driver
+
+
+@pytest.fixture
+def failing_launch(monkeypatch):
+    starter = FakeStarter(RuntimeError("Executable doesn't exist"))
+    monkeypatch.setattr(compare_prices, "async_playwright", lambda: starter)
+    return starter
+
+
+def test_failed_launch_stops_its_driver(failing_launch):
+    pool = BrowserPool(headless=True)
+
+    async def launch_twice():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await pool.new_context("booking")
+        await pool.close()
+
+    asyncio.run(launch_twice())
+    assert len(failing_launch.started) == 2
+    assert all(driver.stopped for driver in failing_launch.started)
+
+
+def test_compare_prices_raises_after_both_sites_settle(failing_launch):
+    query = Query("Hotel", "Tokyo", "2026-01-15", "2026-01-17")
+
+    async def run():
+        async with BrowserPool(headless=True) as pool:
+            with pytest.raises(RuntimeError):
+                await run_compare_prices(query, pool)
+
+    asyncio.run(run())
+    assert failing_launch.started
+    assert all(driver.stopped for driver in failing_launch.started)
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+import compare_prices  # noqa: E402
+from compare_prices import PriceResult, Query, compare_many  # noqa: E402
+
+QUERIES = [Query(f"Hotel {i}", "Tokyo", "2026-01-15", "2026-01-17") for i in range(5)]
+
+
+class FakePage:
+    url = "about:blank"
+
+    async def close(self):
+        await asyncio.sleep(0)
+
+
+class FakeContext:
+    def __init__(self, site, fail_new_page=False):
+        self.site = site
+        self.fail_new_page = fail_new_page
+        self.pages_opened = 0
+        self.closed = False
+
+    async def new_page(self):
+        await asyncio.sleep(0)
+        if self.fail_new_page:
+            raise RuntimeError("context crashed")
+        self.pages_opened += 1
+        return FakePage()
+
+    async def close(self):
+        await asyncio.sleep(0)
+        self.closed = True
+
+
+class FakePool:
+    def __init__(self, failing_sites=()):
+        self.contexts = []
+        self.failing_sites = set(failing_sites)
+
+    async def new_context(self, site):
+        context = FakeContext(site, fail_new_page=site in self.failing_sites)
+        self.failing_sites.discard(site)
+        self.contexts.append(context)
+        return context
+
+
+class Fetchers:
+    def __init__(self, release=None):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = 0
+        self.release = release
+
+    def make(self, site):
+        async def fetch(query, page):
+            self.in_flight += 1
+            self.started += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                if self.release is not None:
+                    await self.release.wait()
+                else:
+                    await asyncio.sleep(0.01)
+            finally:
+                self.in_flight -= 1
+            return PriceResult(site, query.hotel_name, 100.0, "USD", "https://example.test", "total price")
+
+        return fetch
+
+
+@pytest.fixture
+def fetchers(monkeypatch):
+    async def no_wait(origin, last_hit):
+        pass
+
+    monkeypatch.setattr(compare_prices, "_result_cache", type(compare_prices._result_cache)())
+    monkeypatch.setattr(compare_prices, "polite_wait", no_wait)
+    fake = Fetchers()
+    monkeypatch.setattr(compare_prices, "SITE_FETCHERS", {"agoda": fake.make("agoda"), "booking": fake.make("booking")})
+    return fake
+
+
+def test_concurrency_bounds_queries_and_reuses_contexts(fetchers):
+    pool = FakePool()
+    results = asyncio.run(compare_many(QUERIES, concurrency=2, pool=pool))
+
+    assert [[r.hotel_name for r in per_query] for per_query in results] == [[q.hotel_name] * 2 for q in QUERIES]
+    assert fetchers.max_in_flight <= 2 * 2
+    for site in ("agoda", "booking"):
+        site_contexts = [c for c in pool.contexts if c.site == site]
+        assert len(site_contexts) <= 2
+        assert sum(c.pages_opened for c in site_contexts) == len(QUERIES)
+    assert all(c.closed for c in pool.contexts)
+
+
+def test_failed_context_is_closed_and_not_reused(fetchers):
+    pool = FakePool(failing_sites={"booking"})
+    with pytest.raises(RuntimeError, match="context crashed"):
+        asyncio.run(compare_many(QUERIES[:3], concurrency=1, pool=pool))
+
+    booking = [c for c in pool.contexts if c.site == "booking"]
+    assert booking[0].fail_new_page and booking[0].pages_opened == 0
+    assert sum(c.pages_opened for c in booking) == 2
+    assert all(c.closed for c in pool.contexts)
+
+
+def test_cancellation_closes_every_context(fetchers):
+    pool = FakePool()
+
+    async def run():
+        fetchers.release = asyncio.Event()
+        task = asyncio.create_task(compare_many(QUERIES, concurrency=2, pool=pool))
+        while fetchers.started < 4:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert pool.contexts
+    assert all(c.closed for c in pool.contexts)
+
+
+def test_rejects_non_positive_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(compare_many(QUERIES, concurrency=0, pool=FakePool()))
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from compare_prices import (  # noqa: E402
+    AGODA_CURRENCY_SELECTORS,
+    AGODA_PRICE_SELECTORS,
+    BOOKING_PRICE_SELECTORS,
+    extract_texts,
+)
+
+BOOKING_FIELDS = {"price": BOOKING_PRICE_SELECTORS}
+AGODA_FIELDS = {"price": AGODA_PRICE_SELECTORS, "currency": AGODA_CURRENCY_SELECTORS}
+
+
+def test_plain_text():
+    html = '<div><span data-testid="price-and-discounted-price">US$120</span></div>'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$120"}
+
+
+def test_missing_field_is_empty():
+    assert extract_texts("<div><span>US$120</span></div>", BOOKING_FIELDS) == {"price": ""}
+
+
+def test_entities_are_decoded():
+    html = '<span data-testid="price-and-discounted-price">US$&nbsp;1,234&amp;</span>'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$\xa01,234&"}
+
+
+def test_nested_children_are_included():
+    html = '<span data-testid="price-and-discounted-price">US$<b>1<i>2</i></b>0</span>after'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$120"}
+
+
+def test_void_and_self_closing_children():
+    html = '<span data-testid="price-and-discounted-price">US$<br>1<img src="x"><wbr/>20<span/></span>'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$120"}
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<span data-testid="price-and-discounted-price">US$<b>120</span><b>999</b>',
+        '<span data-testid="price-and-discounted-price"><p>US$120</span><p>999</p>',
+    ],
+)
+def test_unclosed_children_end_with_the_target(html):
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$120"}
+
+
+def test_stray_end_tag_is_ignored():
+    html = '<span data-testid="price-and-discounted-price">US$</div>120</span>'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$120"}
+
+
+def test_unterminated_target_keeps_its_text():
+    html = '<div><span data-testid="price-and-discounted-price">US$120'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$120"}
+
+
+def test_any_selector_in_a_field_matches_first_in_document_order():
+    html = '<div data-testid="price-and-discounted-price">US$90</div><span data-testid="price-and-discounted-price">US$120</span>'
+    assert extract_texts(html, BOOKING_FIELDS) == {"price": "US$90"}
+
+
+def test_multiple_fields_in_one_pass():
+    html = (
+        '<div><span data-selenium="hotel-currency">JPY</span>'
+        '<span data-selenium="price">12,000</span>'
+        '<span data-selenium="display-price">11,000</span></div>'
+    )
+    assert extract_texts(html, AGODA_FIELDS) == {"price": "12,000", "currency": "JPY"}
+
+
+def test_nested_fields_are_collected_independently():
+    html = '<span data-selenium="display-price"><span data-selenium="hotel-currency">JPY</span> 12,000</span>'
+    assert extract_texts(html, AGODA_FIELDS) == {"price": "JPY 12,000", "currency": "JPY"}
+
+
+def test_unsupported_selectors_are_skipped():
+    fields = {"price": [".price", "div > span", 'span[data-testid="price-and-discounted-price"]']}
+    html = '<div class="price"><span>US$90</span></div><span data-testid="price-and-discounted-price">US$120</span>'
+    assert extract_texts(html, fields) == {"price": "US$120"}
+
+
+def test_field_with_only_unsupported_selectors_is_empty():
+    assert extract_texts('<div class="price">US$90</div>', {"price": [".price"]}) == {"price": ""}
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+import compare_prices  # noqa: E402
+from compare_prices import Query, fetch_booking_fast  # noqa: E402
+
+QUERY = Query("Hotel", "Tokyo", "2026-01-15", "2026-01-17")
+BOOKING_HTML = '<div><span data-testid="price-and-discounted-price">US$1,234</span></div>'
+
+
+class FakeResponse:
+    ok = True
+
+    def __init__(self, url, body):
+        self.url = url
+        self.body = body
+
+    async def text(self):
+        return self.body
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body = body
+
+    async def get(self, url, **kwargs):
+        return FakeResponse(url, self.body)
+
+
+class FakeContext:
+    def __init__(self, body):
+        self.request = FakeRequest(body)
+
+
+def test_booking_fast_path_parses_static_price():
+    result = asyncio.run(fetch_booking_fast(QUERY, FakeContext(BOOKING_HTML)))
+    assert result.price == 1234.0
+
+
+def test_booking_fast_path_falls_back_when_selectors_are_unsupported(monkeypatch):
+    monkeypatch.setattr(compare_prices, "BOOKING_PRICE_SELECTORS", [".price"])
+    assert asyncio.run(fetch_booking_fast(QUERY, FakeContext(BOOKING_HTML))) is None
+
+
+def test_booking_fast_path_falls_back_on_parse_errors(monkeypatch):
+    def broken(content, fields):
+        raise AttributeError("'NoneType' object has no attribute 'groups'")
+
+    monkeypatch.setattr(compare_prices, "extract_texts", broken)
+    assert asyncio.run(fetch_booking_fast(QUERY, FakeContext(BOOKING_HTML))) is None
@@ -0,0 +1,41 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from compare_prices import is_agoda_search_url  # noqa: E402
+
+
+def parse_qs_reference(url: str) -> bool:
+    """The original parse_qs-based check, kept as the behaviour to match."""
+    parsed = urlparse(url)
+    if "agoda.com" not in parsed.netloc:
+        return False
+    if parsed.path.rstrip("/") != "/search":
+        return False
+    params = parse_qs(parsed.query)
+    return any(key in params for key in ("selectedproperty", "hotel", "checkIn"))
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.agoda.com/search?checkIn=2026-01-15&checkOut=2026-01-17",
+        "https://www.agoda.com/search/?selectedproperty=123",
+        "https://www.agoda.com/search?hotel=5&x=1",
+        "https://www.agoda.com/search?checkIn=",
+        "https://www.agoda.com/search?checkIn",
+        "https://www.agoda.com/search?hotel&x=1",
+        "https://www.agoda.com/search?%68otel=1",
+        "https://www.agoda.com/search?check%49n=2026-01-15",
+        "https://www.agoda.com/search?hotel+name=1",
+        "https://www.agoda.com/search?checkin=2026-01-15",
+        "https://www.agoda.com/search",
+        "https://www.agoda.com/search//?hotel=1",
+        "https://www.agoda.com/en-us/hotel-page.html?hotel=1",
+        "https://www.booking.com/search?hotel=1",
+    ],
+)
+def test_matches_parse_qs_behaviour(url):
+    assert is_agoda_search_url(url) == parse_qs_reference(url)
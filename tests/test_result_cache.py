@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+import compare_prices  # noqa: E402
+from compare_prices import PriceResult, Query, get_cached_result, store_result  # noqa: E402
+
+QUERY = Query("Hotel", "Tokyo", "2026-01-15", "2026-01-17")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(compare_prices, "_result_cache", type(compare_prices._result_cache)())
+    monkeypatch.delenv("AGODA_URL", raising=False)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(compare_prices.time, "monotonic", fake)
+    return fake
+
+
+def priced(site="booking", price=120.0):
+    return PriceResult(site, QUERY.hotel_name, price, "USD", "https://example.test", "total price")
+
+
+def test_hit_within_ttl_and_expiry_evicts(clock):
+    store_result("booking", QUERY, priced())
+    clock.now += compare_prices.RESULT_CACHE_TTL_S - 1
+    assert get_cached_result("booking", QUERY) == priced()
+    clock.now += 1
+    assert get_cached_result("booking", QUERY) is None
+    assert not compare_prices._result_cache
+
+
+def test_results_without_price_are_not_stored(clock):
+    store_result("booking", QUERY, priced(price=None))
+    assert get_cached_result("booking", QUERY) is None
+
+
+def test_sites_are_cached_separately(clock):
+    store_result("booking", QUERY, priced())
+    assert get_cached_result("agoda", QUERY) is None
+
+
+def test_agoda_key_includes_override_url(clock, monkeypatch):
+    monkeypatch.setenv("AGODA_URL", "https://www.agoda.com/search?hotel=1")
+    store_result("agoda", QUERY, priced("agoda"))
+    assert get_cached_result("agoda", QUERY) == priced("agoda")
+    monkeypatch.setenv("AGODA_URL", "https://www.agoda.com/search?hotel=2")
+    assert get_cached_result("agoda", QUERY) is None
+
+
+def test_callers_get_independent_copies(clock):
+    result = priced()
+    store_result("booking", QUERY, result)
+    result.price = 1.0
+    first = get_cached_result("booking", QUERY)
+    first.notes = "changed"
+    second = get_cached_result("booking", QUERY)
+    assert second.price == 120.0
+    assert second.notes == "total price"
+
+
+def test_oldest_entry_is_evicted_past_the_cap(clock, monkeypatch):
+    monkeypatch.setattr(compare_prices, "RESULT_CACHE_MAX_ENTRIES", 2)
+    queries = [Query(f"Hotel {i}", "Tokyo", "2026-01-15", "2026-01-17") for i in range(3)]
+    store_result("booking", queries[0], priced())
+    store_result("booking", queries[1], priced())
+    assert get_cached_result("booking", queries[0]) is not None
+    store_result("booking", queries[2], priced())
+    assert get_cached_result("booking", queries[1]) is None
+    assert get_cached_result("booking", queries[0]) is not None
+    assert get_cached_result("booking", queries[2]) is not None